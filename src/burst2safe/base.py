@@ -2,15 +2,17 @@ import hashlib
 from collections.abc import Iterable
 from copy import deepcopy
 from datetime import datetime, timedelta
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional
 
 import lxml.etree as ET
 
-from burst2safe.utils import BurstInfo, drop_duplicates, flatten, get_subxml_from_metadata, set_text
+from burst2safe.utils import XFDU_NAMESPACE, BurstInfo, drop_duplicates, flatten, get_subxml_from_metadata, set_text
 
 
-SCHEMA = '{urn:ccsds:schema:xfdu:1}'
+SCHEMA = f'{{{XFDU_NAMESPACE}}}'
+CONTENT_UNIT_QNAME = ET.QName(XFDU_NAMESPACE, 'contentUnit')
 
 
 class ListOfListElements:
@@ -29,11 +31,11 @@ class ListOfListElements:
         self.slc_lengths = slc_lengths
 
         self.name = self.inputs[0].tag
-        elements = flatten([element.findall('*') for element in self.inputs])
+        elements = flatten(element.findall('*') for element in self.inputs)
         if len(elements) == 0:
             raise ValueError(f'No Sub-elements contained within {self.name}.')
 
-        names = drop_duplicates([x.tag for x in elements])
+        names = drop_duplicates(x.tag for x in elements)
         if len(names) != 1:
             raise ValueError('Elements must contain only one type of subelement.')
         self.subelement_name = names[0]
@@ -185,7 +187,7 @@ def create_content_unit(simple_name: str, unit_type: str, rep_id: str) -> ET.Ele
     Returns:
         The content unit element.
     """
-    content_unit = ET.Element(f'{SCHEMA}contentUnit')
+    content_unit = ET.Element(CONTENT_UNIT_QNAME)
     content_unit.set('unitType', unit_type)
     content_unit.set('repID', rep_id)
     ET.SubElement(content_unit, 'dataObjectPointer', dataObjectID=simple_name)
@@ -254,13 +256,13 @@ class Annotation:
         self.metadata_type = metadata_type
         self.image_number = image_number
         self.major_version, self.minor_version = [int(v) for v in ipf_version.split('.')]
-        self.metadata_paths = drop_duplicates([x.metadata_path for x in burst_infos])
+        self.metadata_paths = drop_duplicates(x.metadata_path for x in burst_infos)
         self.swath, self.pol = burst_infos[0].swath, burst_infos[0].polarization
         self.start_line = burst_infos[0].burst_index * burst_infos[0].length
         self.total_lines = len(burst_infos) * burst_infos[0].length
         self.stop_line = self.start_line + self.total_lines
-        self.min_anx = min([x.start_utc for x in burst_infos])
-        self.max_anx = max([x.stop_utc for x in burst_infos])
+        self.min_anx = min(burst_infos, key=attrgetter('start_utc')).start_utc
+        self.max_anx = max(burst_infos, key=attrgetter('stop_utc')).stop_utc
 
         self.inputs = [
             get_subxml_from_metadata(path, metadata_type, self.swath, self.pol) for path in self.metadata_paths
@@ -311,14 +313,15 @@ class Annotation:
             out_path: The path to write the annotation to.
             update_info: Whether to update the size and md5 attributes of the annotation.
         """
-        self.xml.write(out_path, pretty_print=True, xml_declaration=True, encoding='utf-8')
+        # Serialize once so the size and md5 can be computed without reading the file back
+        file_bytes = ET.tostring(self.xml, pretty_print=True, xml_declaration=True, encoding='UTF-8')
+        with open(out_path, 'wb') as f:
+            f.write(file_bytes)
 
         if update_info:
             self.path = out_path
-            with open(out_path, 'rb') as f:
-                file_bytes = f.read()
-                self.size_bytes = len(file_bytes)
-                self.md5 = hashlib.md5(file_bytes).hexdigest()
+            self.size_bytes = len(file_bytes)
+            self.md5 = hashlib.md5(file_bytes).hexdigest()
 
     def __str__(self, **kwargs):
         """Return the XML string representation of the annotation.
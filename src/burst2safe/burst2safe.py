@@ -29,6 +29,7 @@ def burst2safe(
     all_anns: bool = False,
     keep_files: bool = False,
     work_dir: Optional[Path] = None,
+    n_workers: int = 1,
 ) -> Path:
     """Convert a set of burst granules to the ESA SAFE format.
 
@@ -49,6 +50,7 @@ def burst2safe(
         all_anns: Include product annotation files for all swaths, regardless of included bursts
         keep_files: Keep the intermediate files
         work_dir: The directory to create the SAFE in (default: current directory)
+        n_workers: The number of swath/polarization groups to create concurrently (default: 1)
     """
     work_dir = utils.optional_wd(work_dir)
 
@@ -64,11 +66,10 @@ def burst2safe(
     print('Download complete.')
 
     print('Creating SAFE...')
-    [info.add_shape_info() for info in burst_infos]
-    [info.add_start_stop_utc() for info in burst_infos]
+    utils.populate_burst_infos(burst_infos)
 
     safe = Safe(burst_infos, all_anns, work_dir)
-    safe_path = safe.create_safe()
+    safe_path = safe.create_safe(n_workers)
     print('SAFE created!')
 
     if not keep_files:
@@ -101,6 +102,12 @@ def main() -> None:
     )
     parser.add_argument('--output-dir', type=str, default=None, help='Output directory to save to')
     parser.add_argument('--keep-files', action='store_true', default=False, help='Keep the intermediate files')
+    parser.add_argument(
+        '--n-workers',
+        type=int,
+        default=1,
+        help='Swath/polarization groups to create concurrently; each holds a full swath in memory. Default: 1',
+    )
 
     args = utils.reparse_args(parser.parse_args(), tool='burst2safe')
 
@@ -115,4 +122,5 @@ def main() -> None:
         all_anns=args.all_anns,
         keep_files=args.keep_files,
         work_dir=args.output_dir,
+        n_workers=args.n_workers,
     )
@@ -32,6 +32,7 @@ def burst2stack(
     all_anns: bool = False,
     keep_files: bool = False,
     work_dir: Optional[Path] = None,
+    n_workers: int = 1,
 ) -> Path:
     """Convert a stack of burst granules to a stack of ESA SAFEs.
     Wraps the burst2safe function to handle multiple dates.
@@ -48,6 +49,7 @@ def burst2stack(
         all_anns: Include product annotation files for all swaths, regardless of included bursts
         keep_files: Keep the intermediate files
         work_dir: The directory to create the SAFE in (default: current directory)
+        n_workers: The number of swath/polarization groups to create concurrently (default: 1)
     """
     absolute_orbits = find_stack_orbits(rel_orbit, extent, start_date, end_date)
     print(f'Creating SAFEs for {len(absolute_orbits)} time periods...')
@@ -64,6 +66,7 @@ def burst2stack(
             all_anns=all_anns,
             keep_files=keep_files,
             work_dir=work_dir,
+            n_workers=n_workers,
         )
 
 
@@ -90,6 +93,12 @@ def main() -> None:
     )
     parser.add_argument('--keep-files', action='store_true', default=False, help='Keep the intermediate files')
     parser.add_argument('--output-dir', type=str, default=None, help='Output directory to save to')
+    parser.add_argument(
+        '--n-workers',
+        type=int,
+        default=1,
+        help='Swath/polarization groups to create concurrently; each holds a full swath in memory. Default: 1',
+    )
 
     args = utils.reparse_args(parser.parse_args(), tool='burst2stack')
 
@@ -105,4 +114,5 @@ def main() -> None:
         all_anns=args.all_anns,
         keep_files=args.keep_files,
         work_dir=args.output_dir,
+        n_workers=args.n_workers,
     )
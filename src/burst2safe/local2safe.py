@@ -2,7 +2,6 @@
 
 import argparse
 import json
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
@@ -53,11 +52,9 @@ def burst_info_from_local(
         metadata_url=metadata_url,
         metadata_path=xml_path,
     )
-    info.add_shape_info()
-    info.add_start_stop_utc()
-    date_format = '%Y%m%dT%H%M%S'
-    start_utc_str = datetime.strftime(info.start_utc, date_format)
-    info.date = datetime.strptime(datetime.strftime(info.start_utc, date_format), date_format)
+    info.populate_from_metadata()
+    start_utc_str = utils.format_compact_time(info.start_utc)
+    info.date = info.start_utc.replace(microsecond=0)
     info.granule = f'S1_{burst_id}_{swath}_{start_utc_str}_{polarization}_{slc_name.split("_")[-1]}-BURST'
     return info
 
@@ -111,6 +108,7 @@ def local2safe(
     all_anns: bool = False,
     keep_files: bool = False,
     work_dir: Optional[Path] = None,
+    n_workers: int = 1,
 ) -> Path:
     """Convert a set of burst granules to the ESA SAFE format using local files
 
@@ -120,6 +118,7 @@ def local2safe(
         all_anns: Include product annotation files for all swaths, regardless of included bursts
         keep_files: Keep the intermediate files
         work_dir: The directory to store temporary files
+        n_workers: The number of swath/polarization groups to create concurrently (default: 1)
 
     Returns:
         The path to the created SAFE
@@ -134,7 +133,7 @@ def local2safe(
     print('Creating SAFE...')
 
     safe = Safe(burst_infos, all_anns, work_dir)
-    safe_path = safe.create_safe()
+    safe_path = safe.create_safe(n_workers)
     print('SAFE created!')
 
     if not keep_files:
@@ -157,11 +156,18 @@ def main():
     )
     parser.add_argument('--all_anns', action='store_true', help='Include all annotations')
     parser.add_argument('--work_dir', type=Path, help='The directory to store temporary files')
+    parser.add_argument(
+        '--n_workers',
+        type=int,
+        default=1,
+        help='Swath/polarization groups to create concurrently; each holds a full swath in memory. Default: 1',
+    )
     args = parser.parse_args()
     slc_tree = json.loads(args.json_tree_path.read_text())
 
     local2safe(
         slc_tree,
-        args.all_anns,
-        args.work_dir,
+        all_anns=args.all_anns,
+        work_dir=args.work_dir,
+        n_workers=args.n_workers,
     )
@@ -7,14 +7,15 @@ import lxml.etree as ET
 import numpy as np
 from shapely.geometry import Polygon
 
-from burst2safe.utils import calculate_crc16
+from burst2safe.base import CONTENT_UNIT_QNAME
+from burst2safe.utils import XFDU_NAMESPACE, XFDU_QNAME, calculate_crc16
 
 
 SAFE_NS = 'http://www.esa.int/safe/sentinel-1.0'
 NAMESPACES = {
     'xsi': 'http://www.w3.org/2001/XMLSchema-instance',
     'gml': 'http://www.opengis.net/gml',
-    'xfdu': 'urn:ccsds:schema:xfdu:1',
+    'xfdu': XFDU_NAMESPACE,
     'safe': SAFE_NS,
     's1': f'{SAFE_NS}/sentinel-1',
     's1sar': f'{SAFE_NS}/sentinel-1/sar',
@@ -22,6 +23,8 @@ NAMESPACES = {
     's1sarl2': f'{SAFE_NS}/sentinel-1/sar/level-2',
     'gx': 'http://www.google.com/kml/ext/2.2',
 }
+INFORMATION_PACKAGE_MAP_QNAME = ET.QName(NAMESPACES['xfdu'], 'informationPackageMap')
+COORDINATES_XPATH = ET.XPath('.//*[local-name()="coordinates"]')
 
 
 def get_footprint_string(bbox: Polygon, x_first=True) -> str:
@@ -34,13 +37,13 @@ def get_footprint_string(bbox: Polygon, x_first=True) -> str:
     Returns:
         A string representation of the product footprint
     """
-    coords = [(np.round(y, 6), np.round(x, 6)) for x, y in bbox.exterior.coords]
+    coords = np.round(np.asarray(bbox.exterior.coords), 6)
     # TODO: order assumes descending
-    coords = [coords[2], coords[3], coords[0], coords[1]]
+    coords = coords[[2, 3, 0, 1]]
     if x_first:
-        coords_str = ' '.join([f'{x},{y}' for x, y in coords])
-    else:
         coords_str = ' '.join([f'{y},{x}' for x, y in coords])
+    else:
+        coords_str = ' '.join([f'{x},{y}' for x, y in coords])
     return coords_str
 
 
@@ -81,10 +84,9 @@ class Manifest:
 
     def create_information_package_map(self):
         """Create the information package map."""
-        xdfu_ns = NAMESPACES['xfdu']
-        information_package_map = ET.Element(f'{{{xdfu_ns}}}informationPackageMap')
+        information_package_map = ET.Element(INFORMATION_PACKAGE_MAP_QNAME)
         parent_content_unit = ET.Element(
-            f'{{{xdfu_ns}}}contentUnit',
+            CONTENT_UNIT_QNAME,
             unitType='SAFE Archive Information Package',
             textInfo='Sentinel-1 IW Level-1 SLC Product',
             dmdID='acquisitionPeriod platform generalProductInformation measurementOrbitReference measurementFrameSet',
@@ -102,7 +104,7 @@ class Manifest:
         for metadata_object in self.metadata_objects:
             metadata_section.append(metadata_object)
 
-        ids_to_keep = [
+        ids_to_keep = {
             'processing',
             'platform',
             'measurementOrbitReference',
@@ -118,12 +120,12 @@ class Manifest:
             's1Level1ProductPreviewSchema',
             's1Level1QuicklookSchema',
             's1MapOverlaySchema',
-        ]
+        }
         for obj in self.template.find('metadataSection'):
             if obj.get('ID') in ids_to_keep:
                 metadata_section.append(deepcopy(obj))
 
-        coordinates = metadata_section.find('.//{*}coordinates')
+        coordinates = COORDINATES_XPATH(metadata_section)[0]
         coordinates.text = get_footprint_string(self.bbox)
 
         self.metadata_section = metadata_section
@@ -140,13 +142,14 @@ class Manifest:
         self.create_metadata_section()
         self.create_data_object_section()
 
-        manifest = ET.Element('{%s}XFDU' % NAMESPACES['xfdu'], nsmap=NAMESPACES)
+        manifest = ET.Element(XFDU_QNAME, nsmap=NAMESPACES)
         manifest.set('version', self.version)
         manifest.append(self.information_package_map)
         manifest.append(self.metadata_section)
         manifest.append(self.data_object_section)
         manifest_tree = ET.ElementTree(manifest)
 
+        # The template metadata carries its own whitespace, which pretty_print will not re-indent
         ET.indent(manifest_tree, space='  ')
         self.xml = manifest_tree
 
@@ -197,9 +200,7 @@ class Kml:
         coordinates = ET.SubElement(lat_lon_quad, 'coordinates')
         coordinates.text = get_footprint_string(self.bbox, x_first=False)
 
-        kml_tree = ET.ElementTree(kml)
-        ET.indent(kml_tree, space='  ')
-        self.xml = kml_tree
+        self.xml = ET.ElementTree(kml)
 
     def write(self, out_path: Path, update_info: bool = True) -> None:
         """Write the SAFE kml to a file.
@@ -339,9 +340,7 @@ class Preview:
         self.add_subsection(body, 'preview/icons', self.preview_icon)
         self.add_subsection(body, 'support', self.support)
 
-        html_tree = ET.ElementTree(html)
-        ET.indent(html_tree, space='  ')
-        self.html = html_tree
+        self.html = ET.ElementTree(html)
 
     def write(self, out_path: Path, update_info=True) -> None:
         """Write the html to a file.
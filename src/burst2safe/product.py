@@ -50,7 +50,7 @@ class Product(Annotation):
         quality_information = ET.Element('qualityInformation')
         quality_information.append(deepcopy(self.inputs[0].find('qualityInformation/productQualityIndex')))
 
-        quality_datas = flatten([cal.findall('qualityInformation/qualityDataList/qualityData') for cal in self.inputs])
+        quality_datas = flatten(cal.findall('qualityInformation/qualityDataList/qualityData') for cal in self.inputs)
         quality_data_list = ET.Element('qualityDataList')
         quality_data_list.set('count', str(len(quality_datas)))
         for quality_data in quality_datas:
@@ -91,7 +91,7 @@ class Product(Annotation):
         ]
         for list_name in lists:
             list_elements = [prod.find(f'generalAnnotation/{list_name}') for prod in self.inputs]
-            if len(flatten([element.findall('*') for element in list_elements])) == 0:
+            if len(flatten(element.findall('*') for element in list_elements)) == 0:
                 filtered = ET.Element(list_elements[0].tag)
                 filtered.set('count', '0')
             elif list_name == 'replicaInformationList':
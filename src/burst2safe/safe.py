@@ -1,19 +1,29 @@
 import bisect
 import shutil
+from collections import defaultdict
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from itertools import product
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Optional, Tuple
 
-import numpy as np
+import lxml.etree as ET
 from shapely.geometry import MultiPolygon, Polygon
 
 from burst2safe.base import create_content_unit, create_data_object, create_metadata_object
 from burst2safe.manifest import Kml, Manifest, Preview
 from burst2safe.product import Product
 from burst2safe.swath import Swath
-from burst2safe.utils import BurstInfo, drop_duplicates, flatten, get_subxml_from_metadata, optional_wd
+from burst2safe.utils import (
+    BurstInfo,
+    drop_duplicates,
+    flatten,
+    format_compact_time,
+    get_subxml_from_metadata,
+    optional_wd,
+)
 
 
 class Safe:
@@ -40,8 +50,11 @@ class Safe:
         self.blank_products = []
         self.manifest = None
         self.kml = None
+        self.bbox = None
+        self.template_manifests = {}
 
-        self.version = self.get_ipf_version(self.burst_infos[0].metadata_path)
+        metadata_path = self.burst_infos[0].metadata_path
+        self.version = self.get_ipf_version(metadata_path, self.get_template_manifest(metadata_path))
         self.major_version, self.minor_version = [int(x) for x in self.version.split('.')]
         self.support_dir = self.get_support_dir()
         self.creation_time = self.get_creation_time()
@@ -54,8 +67,7 @@ class Safe:
             The creation time of the SAFE file
         """
         metadata_paths = list(set([x.metadata_path for x in self.burst_infos]))
-        manifests = [get_subxml_from_metadata(metadata_path, 'manifest') for metadata_path in metadata_paths]
-        manifest = manifests[0]
+        manifests = [self.get_template_manifest(metadata_path) for metadata_path in metadata_paths]
         desired_tag = './/{http://www.esa.int/safe/sentinel-1.0}processing'
         creation_times = []
         for manifest in manifests:
@@ -64,6 +76,19 @@ class Safe:
         creation_time = max(creation_times)
         return creation_time
 
+    def get_template_manifest(self, metadata_path: Path) -> ET.Element:
+        """Get the parent manifest of a metadata file, only parsing each file once.
+
+        Args:
+            metadata_path: Path to the burst metadata file
+
+        Returns:
+            lxml Element for the manifest
+        """
+        if metadata_path not in self.template_manifests:
+            self.template_manifests[metadata_path] = get_subxml_from_metadata(metadata_path, 'manifest')
+        return self.template_manifests[metadata_path]
+
     def get_support_dir(self) -> Path:
         """Find the support directory version closest to but not exceeding the IPF major.minor verion"""
         data_dir = Path(__file__).parent / 'data'
@@ -91,13 +116,21 @@ class Safe:
         Args:
             burst_infos: A list of BurstInfo objects
         """
-        swaths = sorted(list(set([info.swath for info in burst_infos])))
-        polarizations = sorted(list(set([info.polarization for info in burst_infos])))
+        burst_groups = defaultdict(list)
+        for info in burst_infos:
+            burst_groups[(info.swath, info.polarization)].append(info)
+
+        if len(burst_groups) == 1:
+            Swath.check_burst_group_validity(burst_infos)
+            return
+
+        swaths = sorted(set([swath for swath, _ in burst_groups]))
+        polarizations = sorted(set([pol for _, pol in burst_groups]))
         burst_range = {}
         for swath in swaths:
             burst_range[swath] = {}
             for pol in polarizations:
-                burst_subset = [info for info in burst_infos if info.swath == swath and info.polarization == pol]
+                burst_subset = burst_groups.get((swath, pol), [])
                 if len(burst_subset) == 0:
                     burst_range[swath][pol] = [0, 0]
                     continue
@@ -123,10 +156,10 @@ class Safe:
         working_pol = polarizations[0]
         for swath1, swath2 in swath_combos:
             min_diff = burst_range[swath1][working_pol][0] - burst_range[swath2][working_pol][0]
-            if np.abs(min_diff) > 1:
+            if abs(min_diff) > 1:
                 raise ValueError(f'Products from swaths {swath1} and {swath2} do not overlap')
             max_diff = burst_range[swath1][working_pol][1] - burst_range[swath2][working_pol][1]
-            if np.abs(max_diff) > 1:
+            if abs(max_diff) > 1:
                 raise ValueError(f'Products from swaths {swath1} and {swath2} do not overlap')
 
     def get_name(self, unique_id: str = '0000') -> str:
@@ -139,17 +172,27 @@ class Safe:
         Returns:
             The name of the SAFE file
         """
-        platform, beam_mode, product_type = self.burst_infos[0].slc_granule.split('_')[:3]
+        first_burst = self.burst_infos[0]
+        slc_parts = first_burst.slc_granule.split('_')
+        platform, beam_mode, product_type = slc_parts[:3]
+
+        min_date = max_date = first_burst.date
+        pols = set()
+        for burst_info in self.burst_infos:
+            pols.add(burst_info.polarization)
+            if burst_info.date < min_date:
+                min_date = burst_info.date
+            elif burst_info.date > max_date:
+                max_date = burst_info.date
 
         pol_codes = {'HH': 'SH', 'VV': 'SV', 'VH': 'SV', 'HV': 'SV', 'HH_HV': 'DH', 'VH_VV': 'DV'}
-        pols = sorted(list(set([x.polarization for x in self.burst_infos])))
-        pol_code = pol_codes['_'.join(pols)]
+        pol_code = pol_codes['_'.join(sorted(pols))]
         product_info = f'1S{pol_code}'
 
-        min_date = min([x.date for x in self.burst_infos]).strftime('%Y%m%dT%H%M%S')
-        max_date = max([x.date for x in self.burst_infos]).strftime('%Y%m%dT%H%M%S')
-        absolute_orbit = f'{self.burst_infos[0].absolute_orbit:06d}'
-        mission_data_take = self.burst_infos[0].slc_granule.split('_')[-2]
+        min_date = format_compact_time(min_date)
+        max_date = format_compact_time(max_date)
+        absolute_orbit = f'{first_burst.absolute_orbit:06d}'
+        mission_data_take = slc_parts[-2]
         product_name = f'{platform}_{beam_mode}_{product_type}__{product_info}_{min_date}_{max_date}_{absolute_orbit}_{mission_data_take}_{unique_id}.SAFE'
         return product_name
 
@@ -163,31 +206,30 @@ class Safe:
         Returns:
             A dictionary of burst infos grouped by swath, then polarization
         """
-        burst_dict = {}
+        grouped = {}
         for burst_info in burst_infos:
-            if burst_info.swath not in burst_dict:
-                burst_dict[burst_info.swath] = {}
-
-            if burst_info.polarization not in burst_dict[burst_info.swath]:
-                burst_dict[burst_info.swath][burst_info.polarization] = []
+            grouped.setdefault(burst_info.swath, {}).setdefault(burst_info.polarization, []).append(burst_info)
 
-            burst_dict[burst_info.swath][burst_info.polarization].append(burst_info)
+        by_burst_id = attrgetter('burst_id')
+        for pol_dict in grouped.values():
+            for pol_burst_infos in pol_dict.values():
+                pol_burst_infos.sort(key=by_burst_id)
 
-        swaths = list(burst_dict.keys())
-        polarizations = list(burst_dict[swaths[0]].keys())
-        for swath, polarization in zip(swaths, polarizations):
-            burst_dict[swath][polarization] = sorted(burst_dict[swath][polarization], key=lambda x: x.burst_id)
-
-        return burst_dict
+        return grouped
 
     @staticmethod
-    def get_ipf_version(metadata_path: Path) -> str:
+    def get_ipf_version(metadata_path: Path, manifest: Optional[ET.Element] = None) -> str:
         """Get the IPF version from the parent manifest file.
 
+        Args:
+            metadata_path: The path to the metadata file
+            manifest: The already parsed parent manifest, if available
+
         Returns:
             The IPF version as a string
         """
-        manifest = get_subxml_from_metadata(metadata_path, 'manifest')
+        if manifest is None:
+            manifest = get_subxml_from_metadata(metadata_path, 'manifest')
         version_xml = [elem for elem in manifest.findall('.//{*}software') if elem.get('name') == 'Sentinel-1 IPF'][0]
         return version_xml.get('version')
 
@@ -198,13 +240,15 @@ class Safe:
             A Polygon object representing the bounding box
         """
         bboxs = MultiPolygon([swath.bbox for swath in self.swaths])
-        min_rotated_rect = bboxs.minimum_rotated_rectangle
-        bbox = Polygon(min_rotated_rect.exterior)
+        bbox = bboxs.minimum_rotated_rectangle
         return bbox
 
-    def create_dir_structure(self) -> Path:
+    def create_dir_structure(self, copy_support: bool = True) -> Path:
         """Create a directory for the SAFE file.
 
+        Args:
+            copy_support: Whether to also copy the support files into the SAFE directory
+
         Returns:
             The path to the SAFE directory
         """
@@ -221,8 +265,13 @@ class Safe:
         if self.major_version >= 3 and self.minor_version >= 40:
             rfi_dir.mkdir(parents=True, exist_ok=True)
 
+        if copy_support:
+            self.copy_support_files()
+
+    def copy_support_files(self) -> None:
+        """Copy the XSD support files and preview logo into an existing SAFE directory."""
         shutil.copytree(self.support_dir, self.safe_path / 'support', dirs_exist_ok=True)
-        shutil.copy(self.support_dir.parent / 'logo.png', icon_dir / 'logo.png')
+        shutil.copy(self.support_dir.parent / 'logo.png', self.safe_path / 'preview' / 'icons' / 'logo.png')
 
     @staticmethod
     def create_representative_burst_set(template_bursts: Iterable[BurstInfo], swath: str, pol: str) -> List[BurstInfo]:
@@ -237,8 +286,8 @@ class Safe:
         representative_bursts = []
         for slc in unique_slcs:
             slc_bursts = [x for x in template_bursts if x.slc_granule == slc]
-            start_utc = min([x.start_utc for x in slc_bursts])
-            stop_utc = max([x.stop_utc for x in slc_bursts])
+            start_utc = min(slc_bursts, key=attrgetter('start_utc')).start_utc
+            stop_utc = max(slc_bursts, key=attrgetter('stop_utc')).stop_utc
             slc_template = slc_bursts[0]
             new_burst = BurstInfo(
                 None,
@@ -271,34 +320,60 @@ class Safe:
         Returns:
             A list of blank Product objects
         """
-        swaths = list(set([burst.swath for burst in self.burst_infos]))
-        missing_swaths = list(set(['IW1', 'IW2', 'IW3']) - set(swaths))
+        swaths = list(self.grouped_burst_infos)
+        missing_swaths = sorted(set(['IW1', 'IW2', 'IW3']) - set(swaths))
         if not self.all_anns or len(missing_swaths) == 0:
             return []
 
-        pols = list(set([burst.polarization for burst in self.burst_infos]))
+        pols = sorted(set([pol for pol_dict in self.grouped_burst_infos.values() for pol in pol_dict]))
 
         blank_products = []
         for swath, pol in product(missing_swaths, pols):
             image_number += 1
-            relevant_bursts = flatten([self.grouped_burst_infos[s][pol] for s in swaths])
+            relevant_bursts = flatten(self.grouped_burst_infos[s][pol] for s in swaths)
             rep_bursts = self.create_representative_burst_set(relevant_bursts, swath, pol)
             annotation = Product(rep_bursts, self.version, image_number, dummy=True)
             blank_products.append(annotation)
         return blank_products
 
-    def create_safe_components(self) -> None:
-        """Create the components (data and metadata files) of the SAFE file."""
-        swaths = list(self.grouped_burst_infos.keys())
-        polarizations = list(self.grouped_burst_infos[swaths[0]].keys())
-        image_number = 0
-        for swath, polarization in product(swaths, polarizations):
-            image_number += 1
-            burst_infos = self.grouped_burst_infos[swath][polarization]
-            swath = Swath(burst_infos, self.safe_path, self.version, self.creation_time, image_number)
-            swath.assemble()
-            swath.write()
-            self.swaths.append(swath)
+    def create_swath(self, burst_infos: Iterable[BurstInfo], image_number: int) -> Swath:
+        """Create and write the components of a single swath/polarization group.
+
+        Args:
+            burst_infos: A list of BurstInfo objects from one swath and polarization
+            image_number: The image number of the swath
+
+        Returns:
+            The written Swath object
+        """
+        swath = Swath(burst_infos, self.safe_path, self.version, self.creation_time, image_number)
+        swath.assemble()
+        swath.write()
+        return swath
+
+    def create_safe_components(self, n_workers: int = 1) -> None:
+        """Create the components (data and metadata files) of the SAFE file.
+        Each swath/polarization group holds a full swath of data in memory while it is created,
+        so peak memory use grows with the number of groups created concurrently.
+
+        Args:
+            n_workers: The number of swath/polarization groups to create concurrently (default: 1)
+        """
+        # Number groups in sorted order so image numbers do not depend on the order of the input bursts
+        groups = [
+            self.grouped_burst_infos[swath][pol]
+            for swath in sorted(self.grouped_burst_infos)
+            for pol in sorted(self.grouped_burst_infos[swath])
+        ]
+        image_numbers = list(range(1, len(groups) + 1))
+        image_number = len(groups)
+
+        if n_workers <= 1:
+            for burst_infos, number in zip(groups, image_numbers):
+                self.swaths.append(self.create_swath(burst_infos, number))
+        else:
+            with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                self.swaths.extend(executor.map(self.create_swath, groups, image_numbers))
 
         for blank_product in self.create_blank_products(image_number):
             blank_product.assemble()
@@ -307,6 +382,8 @@ class Safe:
             blank_product.write(product_name)
             self.blank_products.append(blank_product)
 
+        self.bbox = self.get_bbox()
+
     def add_preview_components(self, content_units: List, metadata_objects: List, data_objects: List) -> List:
         """Add the preview components to unit lists.
 
@@ -360,19 +437,19 @@ class Safe:
         data_objects = []
         for swath in self.swaths:
             for annotation in swath.annotations:
-                content_unit, metadata_object, date_object = annotation.create_manifest_components()
+                content_unit, metadata_object, data_object = annotation.create_manifest_components()
                 content_units.append(content_unit)
                 metadata_objects.append(metadata_object)
-                data_objects.append(date_object)
+                data_objects.append(data_object)
             measurement_content, measurement_data = swath.measurement.create_manifest_components()
             content_units.append(measurement_content)
             data_objects.append(measurement_data)
 
         for blank_product in self.blank_products:
-            content_unit, metadata_object, date_object = blank_product.create_manifest_components()
+            content_unit, metadata_object, data_object = blank_product.create_manifest_components()
             content_units.append(content_unit)
             metadata_objects.append(metadata_object)
-            data_objects.append(date_object)
+            data_objects.append(data_object)
 
         content_units, metadata_objects, data_objects = self.add_preview_components(
             content_units, metadata_objects, data_objects
@@ -383,15 +460,19 @@ class Safe:
         """Create the manifest.safe file for the SAFE file."""
         manifest_name = self.safe_path / 'manifest.safe'
         content_units, metadata_objects, data_objects = self.compile_manifest_components()
-        template_manifest = get_subxml_from_metadata(self.burst_infos[0].metadata_path, 'manifest')
-        manifest = Manifest(content_units, metadata_objects, data_objects, self.get_bbox(), template_manifest)
+        template_manifest = self.get_template_manifest(self.burst_infos[0].metadata_path)
+        if self.bbox is None:
+            self.bbox = self.get_bbox()
+        manifest = Manifest(content_units, metadata_objects, data_objects, self.bbox, template_manifest)
         manifest.assemble()
         manifest.write(manifest_name)
         self.manifest = manifest
 
     def create_preview(self):
         """Create the support files for the SAFE file."""
-        kml = Kml(self.get_bbox())
+        if self.bbox is None:
+            self.bbox = self.get_bbox()
+        kml = Kml(self.bbox)
         kml.assemble()
         kml.write(self.safe_path / 'preview' / 'map-overlay.kml')
         self.kml = kml
@@ -421,10 +502,18 @@ class Safe:
         for swath in self.swaths:
             swath.update_paths(self.safe_path)
 
-    def create_safe(self) -> Path:
-        """Create the SAFE file."""
-        self.create_dir_structure()
-        self.create_safe_components()
+    def create_safe(self, n_workers: int = 1) -> Path:
+        """Create the SAFE file.
+
+        Args:
+            n_workers: The number of swath/polarization groups to create concurrently (default: 1)
+        """
+        self.create_dir_structure(copy_support=False)
+        # The support files are not needed until the SAFE is complete, so copy them while the swaths are built
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            support_future = executor.submit(self.copy_support_files)
+            self.create_safe_components(n_workers)
+            support_future.result()
         self.create_preview()
         self.create_manifest()
         self.update_product_identifier()
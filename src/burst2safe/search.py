@@ -1,16 +1,15 @@
 """A package for converting ASF burst SLCs to the SAFE format"""
 
+import math
 import warnings
 from collections.abc import Iterable
-from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from itertools import product
-from multiprocessing import cpu_count
+from itertools import product, repeat
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 import asf_search
-import numpy as np
 from asf_search.Products.S1BurstProduct import S1BurstProduct
 from shapely.geometry import Polygon
 
@@ -20,6 +19,11 @@ from burst2safe.utils import BurstInfo, download_url_with_retries
 
 warnings.filterwarnings('ignore')
 
+_SLC_BURST = asf_search.constants.DATASET.SLC_BURST
+_VALID_POLS = frozenset(('VV', 'VH', 'HV', 'HH'))
+_VALID_IW = frozenset(('IW1', 'IW2', 'IW3'))
+_VALID_EW = frozenset(('EW1', 'EW2', 'EW3', 'EW4', 'EW5'))
+
 
 def find_granules(granules: Iterable[str]) -> List[S1BurstProduct]:
     """Find granules by name using ASF Search.
@@ -31,30 +35,33 @@ def find_granules(granules: Iterable[str]) -> List[S1BurstProduct]:
         A list of S1BurstProduct objects
     """
     results = asf_search.search(product_list=granules)
-    found_granules = [result.properties['fileID'] for result in results]
-    missing_granules = list(set(granules) - set(found_granules))
+    found_granules = {result.properties['fileID'] for result in results}
+    missing_granules = set(granules) - found_granules
     if missing_granules:
-        granule_str = ', '.joins(missing_granules)
+        granule_str = ', '.join(sorted(missing_granules))
         raise ValueError(f'Failed to find granule(s) {granule_str}. Check search parameters on Vertex.')
     return list(results)
 
 
-def find_stack_orbits(rel_orbit: int, extent: Polygon, start_date: datetime, end_date: datetime) -> List[int]:
+def find_stack_orbits(
+    rel_orbit: int, extent: Union[Polygon, str], start_date: datetime, end_date: datetime
+) -> List[int]:
     """Find all orbits in a stack using ASF Search.
 
     Args:
         rel_orbit: The relative orbit number of the stack
+        extent: The extent of the stack, or the precomputed WKT of its centroid
         start_date: The start date of the stack
         end_date: The end date of the stack
 
     Returns:
         List of absolute orbit numbers
     """
-    dataset = asf_search.constants.DATASET.SLC_BURST
+    centroid_wkt = extent if isinstance(extent, str) else extent.centroid.wkt
     search_results = asf_search.geo_search(
-        dataset=dataset,
+        dataset=_SLC_BURST,
         relativeOrbit=rel_orbit,
-        intersectsWith=extent.centroid.wkt,
+        intersectsWith=centroid_wkt,
         start=start_date.strftime('%Y-%m-%d'),
         end=end_date.strftime('%Y-%m-%d'),
     )
@@ -79,15 +86,15 @@ def add_surrounding_bursts(bursts: List[S1BurstProduct], min_bursts: int) -> Lis
     absolute_orbit = int(bursts[0].properties['orbit'])
 
     min_id, max_id = min(ids), max(ids)
-    extra = np.floor((min_bursts - (max_id - min_id + 1)) / 2).astype(int)
+    extra = math.floor((min_bursts - (max_id - min_id + 1)) / 2)
     min_id -= extra
     max_id += extra
     if max_id - min_id + 1 != min_bursts:
         max_id += 1
 
-    full_burst_ids = [f'{relative_orbit}_{id:06}_{swath}' for id in range(min_id, max_id + 1)]
+    full_burst_ids = [f'{relative_orbit}_{burst_id:06}_{swath}' for burst_id in range(min_id, max_id + 1)]
     search_results = asf_search.search(
-        dataset=asf_search.constants.DATASET.SLC_BURST,
+        dataset=_SLC_BURST,
         absoluteOrbit=absolute_orbit,
         polarization=polarization,
         fullBurstID=full_burst_ids,
@@ -95,6 +102,27 @@ def add_surrounding_bursts(bursts: List[S1BurstProduct], min_bursts: int) -> Lis
     return search_results
 
 
+def index_search_results(
+    search_results: Iterable[S1BurstProduct],
+) -> Dict[Tuple[str, Optional[str]], List[S1BurstProduct]]:
+    """Index search results by polarization and swath in a single pass.
+    Each result is also indexed under a swath of None, which holds all swaths for a polarization.
+
+    Args:
+        search_results: A list of S1BurstProduct objects
+
+    Returns:
+        A dictionary mapping (polarization, swath) to a list of S1BurstProduct objects
+    """
+    indexed_results = {}
+    for result in search_results:
+        pol = result.properties['polarization']
+        swath = result.properties['burst']['subswath']
+        indexed_results.setdefault((pol, swath), []).append(result)
+        indexed_results.setdefault((pol, None), []).append(result)
+    return indexed_results
+
+
 def find_swath_pol_group(
     search_results: List[S1BurstProduct], pol: str, swath: Optional[str], min_bursts: int
 ) -> List[S1BurstProduct]:
@@ -110,9 +138,28 @@ def find_swath_pol_group(
     Returns:
         An updated list of S1BurstProduct objects
     """
-    if swath:
-        search_results = [result for result in search_results if result.properties['burst']['subswath'] == swath]
-    search_results = [result for result in search_results if result.properties['polarization'] == pol]
+    return find_indexed_swath_pol_group(index_search_results(search_results), pol, swath, min_bursts)
+
+
+def find_indexed_swath_pol_group(
+    indexed_results: Dict[Tuple[str, Optional[str]], List[S1BurstProduct]],
+    pol: str,
+    swath: Optional[str],
+    min_bursts: int,
+) -> List[S1BurstProduct]:
+    """Find a group of bursts with the same polarization and swath from indexed search results.
+    Add surrounding bursts if the group is too small.
+
+    Args:
+        indexed_results: Search results indexed by `index_search_results`
+        pol: The polarization to search for
+        swath: The swath to search for
+        min_bursts: The minimum number of bursts per swath
+
+    Returns:
+        An updated list of S1BurstProduct objects
+    """
+    search_results = indexed_results.get((pol, swath or None), [])
 
     params = [f'polarization {pol}']
     if swath:
@@ -154,32 +201,37 @@ def find_group(
     """
     if polarizations is None:
         polarizations = ['VV']
-    bad_pols = set(polarizations) - set(['VV', 'VH', 'HV', 'HH'])
+    bad_pols = frozenset(polarizations) - _VALID_POLS
     if bad_pols:
         raise ValueError(f'Invalid polarizations: {" ".join(bad_pols)}')
 
     if mode not in ['IW', 'EW']:
         raise ValueError('Invalid mode: must be IW or EW')
     elif mode == 'IW':
-        valid_swaths = ['IW1', 'IW2', 'IW3']
+        valid_swaths = _VALID_IW
     elif mode == 'EW':
-        valid_swaths = ['EW1', 'EW2', 'EW3', 'EW4', 'EW5']
+        valid_swaths = _VALID_EW
 
     if swaths is None:
         swaths = [None]
     else:
-        bad_swaths = set(swaths) - set(valid_swaths)
+        bad_swaths = frozenset(swaths) - valid_swaths
         if bad_swaths:
             raise ValueError(f'Invalid swaths: {" ".join(bad_swaths)}')
 
-    dataset = asf_search.constants.DATASET.SLC_BURST
     search_results = asf_search.geo_search(
-        dataset=dataset, absoluteOrbit=orbit, intersectsWith=footprint.wkt, beamMode=mode
+        dataset=_SLC_BURST, absoluteOrbit=orbit, intersectsWith=footprint.wkt, beamMode=mode
     )
-    final_results = []
-    for pol, swath in product(polarizations, swaths):
-        sub_results = find_swath_pol_group(search_results, pol, swath, min_bursts)
-        final_results.extend(sub_results)
+    indexed_results = index_search_results(search_results)
+    group_definitions = list(product(polarizations, swaths))
+    group_pols = [pol for pol, _ in group_definitions]
+    group_swaths = [swath for _, swath in group_definitions]
+    # Small groups trigger extra searches in add_surrounding_bursts, which can run concurrently
+    with ThreadPoolExecutor(max_workers=max(len(group_definitions), 1)) as executor:
+        groups = executor.map(
+            find_indexed_swath_pol_group, repeat(indexed_results), group_pols, group_swaths, repeat(min_bursts)
+        )
+        final_results = [result for group in groups for result in group]
     return final_results
 
 
@@ -231,10 +283,11 @@ def download_bursts(burst_infos: Iterable[BurstInfo]) -> None:
 
     username, password = get_earthdata_credentials()
     session = asf_search.ASFSession().auth_with_creds(username, password)
-    n_workers = min(len(urls), max(cpu_count() - 2, 1))
+    # Downloads are network-bound, so threads can share a single session
+    n_workers = min(len(urls), 16)
     if n_workers == 1:
         for url, dir, name in zip(urls, dirs, names):
             download_url_with_retries(url, dir, name, session)
     else:
-        with ProcessPoolExecutor(max_workers=n_workers) as executor:
-            executor.map(download_url_with_retries, urls, dirs, names, [session] * len(urls))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(download_url_with_retries, urls, dirs, names, repeat(session)))
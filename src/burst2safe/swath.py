@@ -1,15 +1,18 @@
+from collections import Counter
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 
-from shapely.geometry import MultiPoint, Polygon
+from shapely.geometry import MultiPoint
 
 from burst2safe.calibration import Calibration
 from burst2safe.measurement import Measurement
 from burst2safe.noise import Noise
 from burst2safe.product import Product
 from burst2safe.rfi import Rfi
-from burst2safe.utils import BurstInfo
+from burst2safe.utils import BurstInfo, format_compact_time
 
 
 class Swath:
@@ -33,7 +36,7 @@ class Swath:
             image_number: The image number of the swath
         """
         self.check_burst_group_validity(burst_infos)
-        self.burst_infos = sorted(burst_infos, key=lambda x: x.burst_id)
+        self.burst_infos = sorted(burst_infos, key=attrgetter('burst_id'))
         self.safe_path = safe_path
         self.version = version
         self.creation_time = creation_time
@@ -72,26 +75,33 @@ class Swath:
         Args:
             burst_infos: A list of BurstInfo objects
         """
-        granules = [x.granule for x in burst_infos]
-        duplicates = list(set([x for x in granules if granules.count(x) > 1]))
+        granule_counts = Counter()
+        orbits = set()
+        swaths = set()
+        polarizations = set()
+        burst_ids = []
+        for burst_info in burst_infos:
+            granule_counts[burst_info.granule] += 1
+            orbits.add(burst_info.absolute_orbit)
+            swaths.add(burst_info.swath)
+            polarizations.add(burst_info.polarization)
+            burst_ids.append(burst_info.burst_id)
+
+        duplicates = [granule for granule, count in granule_counts.items() if count > 1]
         if duplicates:
             raise ValueError(f'Found duplicate granules: {duplicates}.')
 
-        orbits = set([x.absolute_orbit for x in burst_infos])
         if len(orbits) != 1:
             raise ValueError(f'All bursts must have the same absolute orbit. Found: {orbits}.')
 
-        swaths = set([x.swath for x in burst_infos])
         if len(swaths) != 1:
             raise ValueError(f'All bursts must be from the same swath. Found: {swaths}.')
 
-        polarizations = set([x.polarization for x in burst_infos])
         if len(polarizations) != 1:
             raise ValueError(f'All bursts must have the same polarization. Found: {polarizations}.')
 
-        burst_ids = [x.burst_id for x in burst_infos]
         burst_ids.sort()
-        if burst_ids != list(range(min(burst_ids), max(burst_ids) + 1)):
+        if burst_ids[-1] - burst_ids[0] + 1 != len(burst_ids) or len(set(burst_ids)) != len(burst_ids):
             raise ValueError(f'All bursts must have consecutive burst IDs. Found: {burst_ids}.')
 
     @staticmethod
@@ -108,8 +118,15 @@ class Swath:
         """
         swath = burst_infos[0].swath.lower()
         pol = burst_infos[0].polarization.lower()
-        start = datetime.strftime(min([x.start_utc for x in burst_infos]), '%Y%m%dt%H%M%S')
-        stop = datetime.strftime(max([x.stop_utc for x in burst_infos]), '%Y%m%dt%H%M%S')
+        start_utc = burst_infos[0].start_utc
+        stop_utc = burst_infos[0].stop_utc
+        for burst_info in burst_infos:
+            if burst_info.start_utc < start_utc:
+                start_utc = burst_info.start_utc
+            if burst_info.stop_utc > stop_utc:
+                stop_utc = burst_info.stop_utc
+        start = format_compact_time(start_utc, separator='t')
+        stop = format_compact_time(stop_utc, separator='t')
 
         safe_name = safe_path.name
         platfrom, _, _, _, _, _, _, orbit, data_take, _ = safe_name.lower().split('_')
@@ -122,9 +139,8 @@ class Swath:
         Returns:
             The bounding box of the swath
         """
-        points = MultiPoint([(gcp.x, gcp.y) for gcp in self.product.gcps])
-        min_rotated_rect = points.minimum_rotated_rectangle
-        bbox = Polygon(min_rotated_rect.exterior)
+        points = [(gcp.x, gcp.y) for gcp in self.product.gcps]
+        bbox = MultiPoint(points).minimum_rotated_rectangle
         return bbox
 
     def assemble(self):
@@ -151,14 +167,23 @@ class Swath:
         Args:
             update_info: Whether to update the bounding box of the Swath
         """
-        self.measurement.write(self.measurement_name)
-        self.product.update_data_stats(self.measurement.data_mean, self.measurement.data_std)
-        self.product.update_burst_byte_offsets(self.measurement.byte_offsets)
-        self.product.write(self.product_name)
-        self.noise.write(self.noise_name)
-        self.calibration.write(self.calibration_name)
-        if self.has_rfi:
-            self.rfi.write(self.rfi_name)
+        # The noise, calibration, and rfi annotations do not depend on the measurement,
+        # so write them while the measurement GeoTIFF is being created
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(self.noise.write, self.noise_name),
+                executor.submit(self.calibration.write, self.calibration_name),
+            ]
+            if self.has_rfi:
+                futures.append(executor.submit(self.rfi.write, self.rfi_name))
+
+            self.measurement.write(self.measurement_name)
+            self.product.update_data_stats(self.measurement.data_mean, self.measurement.data_std)
+            self.product.update_burst_byte_offsets(self.measurement.byte_offsets)
+            self.product.write(self.product_name)
+
+            for future in futures:
+                future.result()
 
         if update_info:
             self.bbox = self.get_bbox()
@@ -169,14 +194,11 @@ class Swath:
         Args:
             safe_path: The new SAFE path
         """
-        for component in self.annotations:
+        parent_name = safe_path.parent.name
+        for component in [*self.annotations, self.measurement]:
             parts = component.path.parts
-            parent_index = parts.index(safe_path.parent.name)
-            component.path = safe_path / Path(*parts[parent_index + 2 :])
-
-        parts = self.measurement.path.parts
-        parent_index = parts.index(safe_path.parent.name)
-        self.measurement.path = safe_path / Path(*parts[parent_index + 2 :])
+            parent_index = parts.index(parent_name)
+            component.path = safe_path.joinpath(*parts[parent_index + 2 :])
 
     def create_manifest_components(self):
         """Create the manifest components for the Swath."""
@@ -1,10 +1,18 @@
-import json
+import mmap
+import os
+import random
+import sys
+import time
 import warnings
 from argparse import Namespace
 from binascii import crc_hqx
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from itertools import chain
+from multiprocessing import cpu_count
+from operator import attrgetter
 from pathlib import Path
 from typing import Dict, List, Optional
 
@@ -12,14 +20,29 @@ import asf_search
 import lxml.etree as ET
 from asf_search.Products.S1BurstProduct import S1BurstProduct
 from osgeo import gdal, ogr, osr
-from shapely.geometry import box, shape
+from shapely import wkb
+from shapely.geometry import box
 
 
 gdal.UseExceptions()
 warnings.filterwarnings('ignore')
 
+# Slotted dataclasses drop the per-instance __dict__, but are only available on Python 3.10+
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Metadata files can exceed libxml2's default size limits, and never need ID tables or entity expansion
+ITERPARSE_OPTIONS = {'events': ('end',), 'huge_tree': True, 'collect_ids': False, 'resolve_entities': False}
+
+XFDU_NAMESPACE = 'urn:ccsds:schema:xfdu:1'
+XFDU_QNAME = ET.QName(XFDU_NAMESPACE, 'XFDU')
+LINES_PER_BURST_XPATH = ET.XPath('swathTiming/linesPerBurst/text()', smart_strings=False)
+SAMPLES_PER_BURST_XPATH = ET.XPath('swathTiming/samplesPerBurst/text()', smart_strings=False)
+BURST_AZIMUTH_TIME_XPATH = ET.XPath('(.//burst)[$position]/azimuthTime/text()', smart_strings=False)
+AZIMUTH_TIME_INTERVAL_XPATH = ET.XPath('(.//azimuthTimeInterval)[1]/text()', smart_strings=False)
+SWATH_POL_CONTENT_XPATH = ET.XPath('self::*[swath = $swath and polarisation = $polarization]/content')
+
+
+@dataclass(**DATACLASS_SLOTS)
 class BurstInfo:
     """Dataclass for storing burst information."""
 
@@ -42,24 +65,40 @@ class BurstInfo:
     length: int = None
     width: int = None
 
-    def add_shape_info(self):
-        """Add shape information to the BurstInfo object."""
-        annotation = get_subxml_from_metadata(self.metadata_path, 'product', self.swath, self.polarization)
-        self.length = int(annotation.find('swathTiming/linesPerBurst').text)
-        self.width = int(annotation.find('swathTiming/samplesPerBurst').text)
+    def add_shape_info(self, annotation: Optional[ET.Element] = None):
+        """Add shape information to the BurstInfo object.
 
-    def add_start_stop_utc(self):
+        Args:
+            annotation: The product annotation of the burst, read from the metadata file if not provided
+        """
+        if annotation is None:
+            annotation = get_subxml_from_metadata(self.metadata_path, 'product', self.swath, self.polarization)
+        self.length = int(LINES_PER_BURST_XPATH(annotation)[0])
+        self.width = int(SAMPLES_PER_BURST_XPATH(annotation)[0])
+
+    def add_start_stop_utc(self, annotation: Optional[ET.Element] = None):
         """Add start and stop UTC to burst info.
         There is spatial overlap between bursts, so burst start/stop times will overlap as well.
+
+        Args:
+            annotation: The product annotation of the burst, read from the metadata file if not provided
         """
-        annotation = get_subxml_from_metadata(self.metadata_path, 'product', self.swath, self.polarization)
-        start_utcs = [datetime.fromisoformat(x.find('azimuthTime').text) for x in annotation.findall('.//burst')]
-        self.start_utc = start_utcs[self.burst_index]
+        if annotation is None:
+            annotation = get_subxml_from_metadata(self.metadata_path, 'product', self.swath, self.polarization)
+        # XPath positions are 1-based, so only the azimuth time of the selected burst is extracted
+        start_utc = BURST_AZIMUTH_TIME_XPATH(annotation, position=self.burst_index + 1)[0]
+        self.start_utc = datetime.fromisoformat(start_utc)
 
-        azimuth_time_interval = float(annotation.find('.//azimuthTimeInterval').text)
+        azimuth_time_interval = float(AZIMUTH_TIME_INTERVAL_XPATH(annotation)[0])
         burst_time_interval = timedelta(seconds=(self.length - 1) * azimuth_time_interval)
         self.stop_utc = self.start_utc + burst_time_interval
 
+    def populate_from_metadata(self):
+        """Add shape information and start/stop UTC using a single read of the metadata file."""
+        annotation = get_subxml_from_metadata(self.metadata_path, 'product', self.swath, self.polarization)
+        self.add_shape_info(annotation)
+        self.add_start_stop_utc(annotation)
+
 
 def create_burst_info(product: S1BurstProduct, work_dir: Path) -> BurstInfo:
     """Create a BurstInfo object given a granule.
@@ -82,9 +121,8 @@ def create_burst_info(product: S1BurstProduct, work_dir: Path) -> BurstInfo:
     burst_id = int(product.properties['burst']['relativeBurstID'])
     burst_index = int(product.properties['burst']['burstIndex'])
 
-    date_format = '%Y%m%dT%H%M%S'
     burst_time_str = burst_granule.split('_')[3]
-    burst_time = datetime.strptime(burst_time_str, date_format)
+    burst_time = parse_compact_time(burst_time_str)
     data_path = work_dir / f'{burst_granule}.tiff'
     metadata_path = work_dir / f'{slc_granule}_{polarization}.xml'
 
@@ -126,6 +164,45 @@ def get_burst_infos(products: Iterable[S1BurstProduct], work_dir: Path) -> List[
     return burst_info_list
 
 
+def populate_burst_group(burst_infos: List[BurstInfo]) -> None:
+    """Add shape information and start/stop UTC to bursts that share a product annotation.
+
+    Args:
+        burst_infos: A list of BurstInfo objects with the same metadata path, swath, and polarization
+    """
+    first_burst = burst_infos[0]
+    annotation = get_subxml_from_metadata(
+        first_burst.metadata_path, 'product', first_burst.swath, first_burst.polarization
+    )
+    for burst_info in burst_infos:
+        burst_info.add_shape_info(annotation)
+        burst_info.add_start_stop_utc(annotation)
+
+
+def populate_burst_infos(burst_infos: Iterable[BurstInfo], n_workers: Optional[int] = None) -> None:
+    """Add shape information and start/stop UTC to BurstInfo objects using multiple workers.
+    Each product annotation is only read once, no matter how many bursts it describes.
+
+    Args:
+        burst_infos: A list of BurstInfo objects
+        n_workers: The number of annotations to read concurrently (default: based on CPU count)
+    """
+    burst_groups = {}
+    for burst_info in burst_infos:
+        key = (burst_info.metadata_path, burst_info.swath, burst_info.polarization)
+        burst_groups.setdefault(key, []).append(burst_info)
+
+    if n_workers is None:
+        n_workers = min(len(burst_groups), max(cpu_count() - 2, 1))
+
+    if n_workers <= 1:
+        for burst_group in burst_groups.values():
+            populate_burst_group(burst_group)
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(populate_burst_group, burst_groups.values()))
+
+
 def sort_burst_infos(burst_info_list: List[BurstInfo]) -> Dict:
     """Sort BurstInfo objects by swath and polarization.
 
@@ -137,18 +214,12 @@ def sort_burst_infos(burst_info_list: List[BurstInfo]) -> Dict:
     """
     burst_infos = {}
     for burst_info in burst_info_list:
-        if burst_info.swath not in burst_infos:
-            burst_infos[burst_info.swath] = {}
-
-        if burst_info.polarization not in burst_infos[burst_info.swath]:
-            burst_infos[burst_info.swath][burst_info.polarization] = []
+        burst_infos.setdefault(burst_info.swath, {}).setdefault(burst_info.polarization, []).append(burst_info)
 
-        burst_infos[burst_info.swath][burst_info.polarization].append(burst_info)
-
-    swaths = list(burst_infos.keys())
-    polarizations = list(burst_infos[swaths[0]].keys())
-    for swath, polarization in zip(swaths, polarizations):
-        burst_infos[swath][polarization] = sorted(burst_infos[swath][polarization], key=lambda x: x.burst_id)
+    by_burst_id = attrgetter('burst_id')
+    for pol_dict in burst_infos.values():
+        for pol_burst_infos in pol_dict.values():
+            pol_burst_infos.sort(key=by_burst_id)
 
     return burst_infos
 
@@ -167,6 +238,40 @@ def optional_wd(wd: Optional[str] = None) -> Path:
     return Path(wd).resolve()
 
 
+def format_compact_time(time: datetime, separator: str = 'T') -> str:
+    """Format a datetime as a compact time string (i.e. 20240408T015108).
+
+    Args:
+        time: The datetime to format
+        separator: The character separating the date and time
+
+    Returns:
+        The formatted time string
+    """
+    return f'{time.year:04d}{time.month:02d}{time.day:02d}{separator}{time.hour:02d}{time.minute:02d}{time.second:02d}'
+
+
+def parse_compact_time(time_str: str) -> datetime:
+    """Parse a compact time string (i.e. 20240408T015108) by slicing its fixed-width fields.
+
+    Args:
+        time_str: The time string to parse
+
+    Returns:
+        The parsed datetime
+    """
+    if len(time_str) != 15 or time_str[8] != 'T':
+        raise ValueError(f'Time string {time_str} is not in the format YYYYMMDDTHHMMSS')
+    return datetime(
+        int(time_str[0:4]),
+        int(time_str[4:6]),
+        int(time_str[6:8]),
+        int(time_str[9:11]),
+        int(time_str[11:13]),
+        int(time_str[13:15]),
+    )
+
+
 def calculate_crc16(file_path: Path) -> str:
     """Calculate the CRC16 checksum for a file.
 
@@ -177,9 +282,15 @@ def calculate_crc16(file_path: Path) -> str:
         CRC16 checksum as a hexadecimal string
     """
     with open(file_path, 'rb') as f:
-        data = f.read()
-
-    crc = f'{crc_hqx(data, 0xffff):04X}'
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return f'{crc_hqx(b"", 0xffff):04X}'
+
+        # crc_hqx accepts any buffer, so the mapped file is checksummed without being read into memory
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                data.madvise(mmap.MADV_SEQUENTIAL)
+            crc = f'{crc_hqx(data, 0xffff):04X}'
     return crc
 
 
@@ -197,12 +308,13 @@ def get_subxml_from_metadata(
     Returns:
         lxml Element for desired metadata
     """
-    with open(metadata_path) as metadata_file:
-        metadata = ET.parse(metadata_file).getroot()
-
     if xml_type == 'manifest':
-        desired_metadata = metadata.find('manifest/{urn:ccsds:schema:xfdu:1}XFDU')
-        return desired_metadata
+        with open(metadata_path, 'rb') as metadata_file:
+            events = ET.iterparse(metadata_file, tag=XFDU_QNAME, **ITERPARSE_OPTIONS)
+            for _, element in events:
+                if element.getparent().tag == 'manifest':
+                    return element
+        return None
 
     possible_types = ['product', 'noise', 'calibration', 'rfi']
     if xml_type not in possible_types:
@@ -211,22 +323,36 @@ def get_subxml_from_metadata(
     if subswath is None or polarization is None:
         raise ValueError('subswath and polarization must be provided for non-manifest files')
 
-    correct_type = [x for x in metadata.find('metadata').iterchildren() if x.tag == xml_type]
-    correct_swath = [x for x in correct_type if x.find('swath').text == subswath]
-    correct_pol = [x for x in correct_swath if x.find('polarisation').text == polarization]
+    desired_metadata = None
+    with open(metadata_path, 'rb') as metadata_file:
+        for _, element in ET.iterparse(metadata_file, tag=xml_type, **ITERPARSE_OPTIONS):
+            parent = element.getparent()
+            if parent is None or parent.tag != 'metadata':
+                continue
 
-    if not correct_pol:
-        desired_metadata = None
-    else:
-        desired_metadata = correct_pol[0].find('content')
+            content = SWATH_POL_CONTENT_XPATH(element, swath=subswath, polarization=polarization)
+            if content:
+                desired_metadata = content[0]
+                break
+
+            # Free sections we have already checked to bound memory use
+            element.clear()
+            while element.getprevious() is not None:
+                del parent[0]
 
     return desired_metadata
 
 
 def download_url_with_retries(
-    url: str, path: str, filename: str = None, session: asf_search.ASFSession = None, max_retries: int = 3
+    url: str,
+    path: str,
+    filename: str = None,
+    session: asf_search.ASFSession = None,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
 ) -> None:
     """Download a file using asf_search.download_url with retries and backoff.
+    Network and server errors are retried, while authentication and client errors are raised immediately.
 
     Args:
         url: The URL to download
@@ -234,27 +360,36 @@ def download_url_with_retries(
         filename: The name of the file to save
         session: The ASF session to use
         max_retries: The maximum number of retries
+        backoff_factor: The base delay in seconds, which doubles after each failed attempt
     """
-    n_retries = 0
-    file_exists = False
-    while n_retries < max_retries and not file_exists:
-        asf_search.download_url(url, path, filename, session)
+    out_path = os.path.join(path, filename)
+    for attempt in range(max_retries):
+        if os.path.exists(out_path):
+            return
+
+        try:
+            asf_search.download_url(url, path, filename, session)
+        except OSError:
+            # Remove partially written files so they are not mistaken for complete downloads
+            if os.path.exists(out_path):
+                os.remove(out_path)
 
-        n_retries += 1
-        if Path(path, filename).exists():
-            file_exists = True
+        if os.path.exists(out_path):
+            return
 
-    if not file_exists:
-        raise ValueError(f'Failed to download {filename} after {max_retries} attempts.')
+        if attempt < max_retries - 1:
+            time.sleep(backoff_factor * 2**attempt + random.uniform(0, 0.1))
 
+    raise ValueError(f'Failed to download {filename} after {max_retries} attempts.')
 
-def flatten(list_of_lists: List[List]) -> List:
-    """Flatten a list of lists."""
-    return [item for sublist in list_of_lists for item in sublist]
 
+def flatten(list_of_lists: Iterable[Iterable]) -> List:
+    """Flatten an iterable of iterables into a list."""
+    return list(chain.from_iterable(list_of_lists))
 
-def drop_duplicates(input_list: List) -> List:
-    """Drop duplicates from a list, while preserving order."""
+
+def drop_duplicates(input_list: Iterable) -> List:
+    """Drop duplicates from an iterable, while preserving order."""
     return list(dict.fromkeys(input_list))
 
 
@@ -265,11 +400,13 @@ def set_text(element: ET.Element, text: str) -> None:
         element: The element to set the text of.
         text: The text to set the element to.
     """
-    if not isinstance(text, str) and not isinstance(text, int):
+    if isinstance(text, str):
+        element.text = text
+    elif isinstance(text, int):
+        element.text = str(text)
+    else:
         raise ValueError('Text must be a string or an integer.')
 
-    element.text = str(text)
-
 
 def vector_to_shapely_latlon_polygon(vector_file_path):
     dataset = ogr.Open(vector_file_path)
@@ -295,7 +432,7 @@ def vector_to_shapely_latlon_polygon(vector_file_path):
         transform = osr.CoordinateTransformation(source_srs, target_srs)
         geom.Transform(transform)
 
-    polygon = shape(json.loads(geom.ExportToJson()))
+    polygon = wkb.loads(bytes(geom.ExportToWkb()))
     dataset = None
 
     return polygon
@@ -14,7 +14,7 @@ def pytest_configure(config):
     config.addinivalue_line('filterwarnings', 'ignore::RuntimeWarning')
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def test_data_dir():
     return TEST_DIR / 'test_data'
 
@@ -24,23 +24,23 @@ def test_data_dir():
 #     return test_data_dir / 'S1A_IW_SLC__1SDV_20200604T022251_20200604T022318_032861_03CE65_7C85_VV.xml'
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def test_data1_xml(test_data_dir):
     return test_data_dir / 'S1A_IW_SLC__1SDV_20240408T015045_20240408T015113_053336_06778C_CB5D_VV.xml'
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def test_data2_xml(test_data_dir):
     return test_data_dir / 'S1A_IW_SLC__1SDV_20240408T015111_20240408T015138_053336_06778C_CA9A_VV.xml'
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def xsd_dir():
     xsd_dir = Path(__file__).parent.parent / 'src' / 'burst2safe' / 'data' / 'support_340'
     return xsd_dir
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def search_result1():
     product = asf_search.ASFProduct()
     product.umm = {'InputGranules': ['S1A_IW_SLC__1SDV_20200604T022251_20200604T022318_032861_03CE65_7C85']}
@@ -66,7 +66,7 @@ def search_result1():
     return product
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def burst_info1(test_data1_xml):
     burst_info = BurstInfo(
         granule='S1_135526_IW2_20240408T015108_VV_CB5D-BURST',
@@ -91,7 +91,7 @@ def burst_info1(test_data1_xml):
     return burst_info
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def burst_info2(test_data2_xml):
     burst_info = BurstInfo(
         granule='S1_135527_IW2_20240408T015111_VV_CA9A-BURST',
@@ -116,6 +116,6 @@ def burst_info2(test_data2_xml):
     return burst_info
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def burst_infos(burst_info1, burst_info2):
     return [burst_info1, burst_info2]
@@ -1,12 +1,16 @@
 import os
 import shutil
+import subprocess
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from multiprocessing import Pool
 from pathlib import Path
 from zipfile import ZipFile
 
 import asf_search as asf
 import lxml.etree as ET
-import numpy as np
 
 from burst2safe.utils import get_burst_infos
 
@@ -38,6 +42,10 @@ VERSIONS = [
     ('Current', datetime.now(), False),
 ]
 
+COPY_BUFFER_SIZE = 128 * 1024
+SOFTWARE_TAG = '{*}software'
+IPF_NAME = 'Sentinel-1 IPF'
+
 
 def find_representative_bursts(important_only=False):
     options = {
@@ -50,13 +58,13 @@ def find_representative_bursts(important_only=False):
     }
     results = asf.search(**options)
     bursts = sorted(get_burst_infos(results, Path.cwd()), key=lambda x: x.date)
+    burst_dates = [burst.date for burst in bursts]
+    # Bursts are sorted by date, so each version's bursts form a contiguous slice
+    bounds = [bisect_left(burst_dates, version_date) for _, version_date, _ in VERSIONS]
     mid_bursts = []
     for i in range(len(VERSIONS) - 1):
-        date1 = VERSIONS[i][1]
-        date2 = VERSIONS[i + 1][1]
-        bursts_between = [burst for burst in bursts if date1 <= burst.date < date2]
-        mid_index = int(np.floor(len(bursts_between) / 2))
-        mid_burst = bursts_between[mid_index]
+        bursts_between = bursts[bounds[i] : bounds[i + 1]]
+        mid_burst = bursts_between[len(bursts_between) // 2]
         if important_only:
             if VERSIONS[i][2]:
                 mid_bursts.append(mid_burst)
@@ -71,14 +79,16 @@ def download_slcs():
     slcs.download('.')
 
 
+@lru_cache(maxsize=None)
 def get_version(slc_path):
     slc_name = f"{slc_path.name.split('.')[0]}.SAFE"
-    with ZipFile(slc_path) as z:
-        manifest_str = z.read(f'{slc_name}/manifest.safe')
-        manifest = ET.fromstring(manifest_str)
+    with ZipFile(slc_path) as z, z.open(f'{slc_name}/manifest.safe') as manifest:
+        for _, element in ET.iterparse(manifest, tag=SOFTWARE_TAG):
+            if element.get('name') == IPF_NAME:
+                return element.get('version')
+            element.clear()
 
-    version_xml = [elem for elem in manifest.findall('.//{*}software') if elem.get('name') == 'Sentinel-1 IPF'][0]
-    return version_xml.get('version')
+    raise ValueError(f'No {IPF_NAME} version found in {slc_path.name}')
 
 
 def get_versions(slc_paths):
@@ -90,31 +100,37 @@ def extract_support_folder(slc_path):
     version = get_version(slc_path).replace('.', '')
     out_dir = Path(f'support_{version}')
     out_dir.mkdir(exist_ok=True)
-    slc_name = f"{slc_path.name.split('.')[0]}.SAFE"
+    support_prefix = f"{slc_path.name.split('.')[0]}.SAFE/support/"
     with ZipFile(slc_path) as zip_ref:
-        for file_info in zip_ref.infolist():
-            if file_info.filename.startswith(f'{slc_name}/support/') and not file_info.is_dir():
-                source_file = zip_ref.open(file_info)
-                target_path = out_dir / Path(file_info.filename).name
-                with open(target_path, 'wb') as target_file:
-                    shutil.copyfileobj(source_file, target_file)
+        members = [x for x in zip_ref.infolist() if x.filename.startswith(support_prefix) and not x.is_dir()]
+        for file_info in members:
+            target_path = out_dir / Path(file_info.filename).name
+            with zip_ref.open(file_info) as source_file, open(target_path, 'wb') as target_file:
+                shutil.copyfileobj(source_file, target_file, length=COPY_BUFFER_SIZE)
+
+
+def extract_support_folders(slc_paths):
+    # Decompression is CPU-bound, so each SLC is extracted in its own process
+    with Pool(os.cpu_count()) as pool:
+        pool.map(extract_support_folder, slc_paths)
+
+
+def create_diff(support1, support2):
+    diff_file = Path(f'diff_{support1.name}_{support2.name}.txt')
+    with open(diff_file, 'wb') as f:
+        subprocess.run(['git', 'diff', '--no-index', str(support1), str(support2)], stdout=f, check=False)
 
 
 def create_diffs():
     supports = sorted(Path().glob('support*'))
-    for i in range(len(supports) - 1):
-        support1 = supports[i]
-        support2 = supports[i + 1]
-        diff_file = Path(f'diff_{support1.name}_{support2.name}.txt')
-        diff_file.touch()
-        os.system(f'git diff --no-index {support1} {support2} > {diff_file}')
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(create_diff, supports[:-1], supports[1:]))
 
 
 def identify_changing_versions():
     download_slcs()
     slc_paths = sorted(list(Path().glob('*.zip')))
-    for slc_path in slc_paths:
-        extract_support_folder(slc_path)
+    extract_support_folders(slc_paths)
     create_diffs()
 
 
@@ -137,8 +153,7 @@ def download_representative_support():
     slcs = asf.granule_search(slcs)
     slcs.download('.')
     slc_paths = sorted(list(Path().glob('*.zip')))
-    for slc_path in slc_paths:
-        extract_support_folder(slc_path)
+    extract_support_folders(slc_paths)
 
 
 if __name__ == '__main__':
@@ -8,11 +8,15 @@ from osgeo import gdal, osr
 gdal.UseExceptions()
 
 
-def create_test_geotiff(output_file, dtype='float', value=1, shape=(10, 10, 1)):
+def create_test_geotiff(output_file, dtype='float32', value=1, shape=(10, 10, 1)):
     """Create a test geotiff for testing"""
-    opts = {'float': (np.float64, gdal.GDT_Float64), 'cfloat': (np.complex64, gdal.GDT_CFloat32)}
+    opts = {
+        'float32': (np.float32, gdal.GDT_Float32),
+        'float': (np.float64, gdal.GDT_Float64),
+        'cfloat': (np.complex64, gdal.GDT_CFloat32),
+    }
     np_dtype, gdal_dtype = opts[dtype]
-    data = np.ones(shape[0:2], dtype=np_dtype) * value
+    data = np.full(shape[0:2], value, dtype=np_dtype)
     geotransform = [0.0, 1.0, 0.0, 0.0, 0.0, 1.0]
     driver = gdal.GetDriverByName('GTiff')
     dataset = driver.Create(output_file, shape[1], shape[0], shape[2], gdal_dtype)
@@ -1,10 +1,15 @@
+import threading
+import time
 from collections import namedtuple
 from copy import deepcopy
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 from shapely.geometry import Polygon
 
 from burst2safe.safe import Safe
+from burst2safe.utils import get_subxml_from_metadata
 
 
 class TestSafe:
@@ -89,10 +94,31 @@ class TestSafe:
         assert grouped['IW2']['VV'] == [burst5, burst7]
         assert grouped['IW2']['VH'] == [burst6, burst8]
 
+    def test_group_burst_infos_sorted(self):
+        BurstStub = namedtuple('BurstStub', ['swath', 'polarization', 'burst_id'])
+        burst1 = BurstStub(swath='IW1', polarization='VV', burst_id=2)
+        burst2 = BurstStub(swath='IW1', polarization='VH', burst_id=2)
+        burst3 = BurstStub(swath='IW1', polarization='VV', burst_id=1)
+        burst4 = BurstStub(swath='IW1', polarization='VH', burst_id=1)
+
+        grouped = Safe.group_burst_infos([burst1, burst2, burst3, burst4])
+        assert grouped['IW1']['VV'] == [burst3, burst1]
+        assert grouped['IW1']['VH'] == [burst4, burst2]
+
     def test_get_ipf_version(self, burst_infos):
         version = Safe.get_ipf_version(burst_infos[0].metadata_path)
         assert version == '003.71'
 
+        manifest = get_subxml_from_metadata(burst_infos[0].metadata_path, 'manifest')
+        assert Safe.get_ipf_version(burst_infos[0].metadata_path, manifest) == '003.71'
+
+    def test_get_template_manifest(self, burst_infos, tmp_path):
+        safe = Safe(burst_infos, work_dir=tmp_path)
+        metadata_path = burst_infos[0].metadata_path
+        manifest = safe.get_template_manifest(metadata_path)
+        assert manifest.tag == '{urn:ccsds:schema:xfdu:1}XFDU'
+        assert safe.get_template_manifest(metadata_path) is manifest
+
     def test_get_bbox(self, burst_infos, tmp_path):
         safe = Safe(burst_infos, work_dir=tmp_path)
 
@@ -105,6 +131,51 @@ class TestSafe:
         bbox = safe.get_bbox()
         assert bbox == polygon_merged
 
+    def test_create_safe_components_numbering(self, burst_infos, tmp_path):
+        safe = Safe(burst_infos, work_dir=tmp_path)
+        safe.grouped_burst_infos = {
+            'IW2': {'VV': ['iw2-vv'], 'VH': ['iw2-vh']},
+            'IW1': {'VH': ['iw1-vh'], 'VV': ['iw1-vv']},
+        }
+        with patch.object(Safe, 'create_swath', side_effect=lambda infos, number: (infos[0], number)):
+            with patch.object(Safe, 'get_bbox'), patch('burst2safe.safe.ThreadPoolExecutor') as mock_executor:
+                safe.create_safe_components()
+        mock_executor.assert_not_called()
+        assert safe.swaths == [('iw1-vh', 1), ('iw1-vv', 2), ('iw2-vh', 3), ('iw2-vv', 4)]
+
+    def test_create_safe_components_threaded(self, burst_infos, tmp_path):
+        safe = Safe(burst_infos, work_dir=tmp_path)
+        safe.grouped_burst_infos = {
+            'IW1': {'VH': ['iw1-vh'], 'VV': ['iw1-vv']},
+            'IW2': {'VH': ['iw2-vh'], 'VV': ['iw2-vv']},
+        }
+        threads = set()
+
+        def create_swath(infos, number):
+            # Later groups finish first, so results must be reordered by image number
+            time.sleep(0.05 * (4 - number))
+            threads.add(threading.get_ident())
+            return infos[0], number
+
+        with patch.object(Safe, 'create_swath', side_effect=create_swath):
+            with patch.object(Safe, 'get_bbox'):
+                safe.create_safe_components(n_workers=4)
+        assert safe.swaths == [('iw1-vh', 1), ('iw1-vv', 2), ('iw2-vh', 3), ('iw2-vv', 4)]
+        assert len(threads) > 1
+
+    def test_create_preview_computes_bbox(self, burst_infos, tmp_path):
+        safe = Safe(burst_infos, work_dir=tmp_path)
+        polygon = Polygon([(1, 1), (1, 2), (2, 2), (2, 1), (1, 1)])
+        fields = ['bbox', 'product_name', 'noise_name', 'calibration_name', 'measurement_name', 'rfi_name', 'has_rfi']
+        SwathStub = namedtuple('SwathStub', fields)
+        safe.swaths = [SwathStub(polygon, Path('p.xml'), Path('n.xml'), Path('c.xml'), Path('m.tiff'), None, False)]
+
+        assert safe.bbox is None
+        with patch('burst2safe.safe.Kml') as mock_kml, patch('burst2safe.safe.Preview'):
+            safe.create_preview()
+        assert safe.bbox == polygon
+        mock_kml.assert_called_once_with(polygon)
+
     def test_create_dir_structure(self, burst_infos, tmp_path):
         safe = Safe(burst_infos, work_dir=tmp_path)
         safe.create_dir_structure()
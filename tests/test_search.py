@@ -1,7 +1,9 @@
 from collections import namedtuple
+from datetime import datetime
 from unittest.mock import patch
 
 import pytest
+from shapely.geometry import Polygon
 
 from burst2safe import search
 
@@ -34,3 +36,51 @@ def test_add_surrounding_bursts(product):
         mock_search.assert_called_once_with(
             dataset='SLC-BURST', absoluteOrbit=1, polarization='VV', fullBurstID=burst_ids
         )
+
+
+def test_index_search_results():
+    BurstProduct = namedtuple('BurstProduct', ['properties'])
+    results = [
+        BurstProduct(properties={'polarization': pol, 'burst': {'subswath': swath}})
+        for pol, swath in [('VV', 'IW1'), ('VH', 'IW1'), ('VV', 'IW2')]
+    ]
+    indexed = search.index_search_results(results)
+    assert indexed[('VV', 'IW1')] == [results[0]]
+    assert indexed[('VV', 'IW2')] == [results[2]]
+    assert indexed[('VV', None)] == [results[0], results[2]]
+    assert indexed[('VH', None)] == [results[1]]
+    assert ('VH', 'IW2') not in indexed
+
+
+def test_find_swath_pol_group():
+    BurstProduct = namedtuple('BurstProduct', ['properties'])
+    results = [
+        BurstProduct(properties={'polarization': pol, 'burst': {'subswath': swath}})
+        for pol, swath in [('VV', 'IW1'), ('VH', 'IW1'), ('VV', 'IW2')]
+    ]
+    assert search.find_swath_pol_group(results, 'VV', 'IW2', 1) == [results[2]]
+    assert search.find_swath_pol_group(results, 'VV', None, 1) == [results[0], results[2]]
+    with pytest.raises(ValueError, match='No bursts found for polarization VH, swath IW2'):
+        search.find_swath_pol_group(results, 'VH', 'IW2', 1)
+
+
+def test_find_granules_missing():
+    BurstProduct = namedtuple('BurstProduct', ['properties'])
+    found = [BurstProduct(properties={'fileID': 'GRANULE_A'})]
+    with patch('burst2safe.search.asf_search.search', return_value=found):
+        assert search.find_granules(['GRANULE_A']) == found
+        with pytest.raises(ValueError, match='Failed to find granule\\(s\\) GRANULE_B, GRANULE_C'):
+            search.find_granules(['GRANULE_C', 'GRANULE_A', 'GRANULE_B'])
+
+
+def test_find_stack_orbits_centroid_wkt():
+    BurstProduct = namedtuple('BurstProduct', ['properties'])
+    results = [BurstProduct(properties={'orbit': orbit}) for orbit in ['2', '1', '2']]
+    extent = Polygon([(0, 0), (0, 2), (2, 2), (2, 0), (0, 0)])
+    start, end = datetime(2024, 1, 1), datetime(2024, 2, 1)
+    with patch('burst2safe.search.asf_search.geo_search', return_value=results) as mock_search:
+        assert sorted(search.find_stack_orbits(1, extent, start, end)) == [1, 2]
+        assert mock_search.call_args.kwargs['intersectsWith'] == 'POINT (1 1)'
+
+        assert sorted(search.find_stack_orbits(1, 'POINT (1 1)', start, end)) == [1, 2]
+        assert mock_search.call_args.kwargs['intersectsWith'] == 'POINT (1 1)'
@@ -57,6 +57,11 @@ class TestSwath:
         with pytest.raises(ValueError, match='All bursts must have consecutive burst IDs. Found:.*'):
             Swath.check_burst_group_validity(non_consecutive_burst_ids)
 
+        burst3 = BurstStub(granule='S1A_IW_SLC_20210103', absolute_orbit=1, swath='IW1', polarization='VV', burst_id=3)
+        repeated_burst_ids = [burst1, BurstStub(*burst2._replace(burst_id=1)), burst3]
+        with pytest.raises(ValueError, match='All bursts must have consecutive burst IDs. Found:.*'):
+            Swath.check_burst_group_validity(repeated_burst_ids)
+
     def test_get_swath_name(self, burst_infos):
         safe_path = Path('./S1A_IW_SLC__1SDV_20240408T015045_20240408T015113_053336_06778C_CB5D.SAFE')
         assert (
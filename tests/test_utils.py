@@ -43,6 +43,38 @@ def test_add_start_stop_utc(burst_info1):
         assert tmp_burst.stop_utc == datetime.fromisoformat('2020-01-01T00:00:19')
 
 
+def test_populate_from_metadata(burst_info1):
+    tmp_burst = deepcopy(burst_info1)
+    tmp_burst.length = None
+    tmp_burst.width = None
+    tmp_burst.start_utc = None
+    tmp_burst.stop_utc = None
+    with patch('burst2safe.utils.get_subxml_from_metadata', wraps=utils.get_subxml_from_metadata) as mock_subxml:
+        tmp_burst.populate_from_metadata()
+        mock_subxml.assert_called_once()
+
+    assert tmp_burst.length == burst_info1.length
+    assert tmp_burst.width == burst_info1.width
+    assert tmp_burst.start_utc == burst_info1.start_utc
+    assert tmp_burst.stop_utc == burst_info1.stop_utc
+
+
+def test_populate_burst_infos(burst_info1, burst_info2):
+    tmp_bursts = [deepcopy(burst_info1), deepcopy(burst_info1), deepcopy(burst_info2)]
+    tmp_bursts[1].burst_index -= 1
+    for burst in tmp_bursts:
+        burst.length, burst.width, burst.start_utc, burst.stop_utc = None, None, None, None
+
+    with patch('burst2safe.utils.get_subxml_from_metadata', wraps=utils.get_subxml_from_metadata) as mock_subxml:
+        utils.populate_burst_infos(tmp_bursts, n_workers=2)
+        assert mock_subxml.call_count == 2
+
+    assert tmp_bursts[0].start_utc == burst_info1.start_utc
+    assert tmp_bursts[1].start_utc < burst_info1.start_utc
+    assert tmp_bursts[2].stop_utc == burst_info2.stop_utc
+    assert all(burst.length is not None and burst.width is not None for burst in tmp_bursts)
+
+
 def test_create_burst_info(tmp_path, search_result1):
     burst_granule = 'S1_136231_IW2_20200604T022312_VV_7C85-BURST'
     slc_granule = 'S1A_IW_SLC__1SDV_20200604T022251_20200604T022318_032861_03CE65_7C85'
@@ -82,7 +114,7 @@ def test_sort_burst_infos():
     info6 = StubInfo('IW1', 'HH', 2)
     info7 = StubInfo('IW2', 'VV', 2)
     info8 = StubInfo('IW2', 'HH', 2)
-    infos = [info1, info3, info5, info2, info8, info4, info6, info7]
+    infos = [info1, info7, info5, info6, info8, info4, info2, info3]
 
     sorted_infos = utils.sort_burst_infos(infos)
 
@@ -103,11 +135,28 @@ def test_optional_wd():
     assert wd == Path(existing_dir).resolve()
 
 
+def test_format_compact_time():
+    time = datetime(2024, 4, 8, 1, 51, 8, 355601)
+    assert utils.format_compact_time(time) == '20240408T015108'
+    assert utils.format_compact_time(time, separator='t') == '20240408t015108'
+
+
 def test_calculate_crc16(tmp_path, test_data_dir):
     manifest_file = test_data_dir / 'manifest_7C85.safe'
     crc = utils.calculate_crc16(manifest_file)
     assert crc == '7C85'
 
+    empty_file = tmp_path / 'empty.txt'
+    empty_file.touch()
+    assert utils.calculate_crc16(empty_file) == 'FFFF'
+
+
+def test_parse_compact_time():
+    assert utils.parse_compact_time('20240408T015108') == datetime(2024, 4, 8, 1, 51, 8)
+
+    with pytest.raises(ValueError):
+        utils.parse_compact_time('20240408T0151')
+
 
 @pytest.mark.parametrize('xml_type, swath', [('product', 'IW1'), ('noise', 'IW2'), ('calibration', 'IW3')])
 def test_get_subxml_from_metadata(xml_type, swath, test_data1_xml):
@@ -135,6 +184,31 @@ def test_get_subxml_from_metadata_manifest(test_data1_xml):
     assert result.tag == '{urn:ccsds:schema:xfdu:1}XFDU'
 
 
+def test_download_url_with_retries(tmp_path):
+    def flaky_download(url, path, filename, session):
+        if mock_download.call_count == 1:
+            Path(path, filename).write_text('partial')
+            raise ConnectionError('Connection reset')
+        Path(path, filename).write_text('complete')
+
+    with patch('burst2safe.utils.asf_search.download_url', side_effect=flaky_download) as mock_download:
+        with patch('burst2safe.utils.time.sleep') as mock_sleep:
+            utils.download_url_with_retries('https://example.com/foo.xml', tmp_path, 'foo.xml')
+            assert mock_download.call_count == 2
+            assert mock_sleep.call_count == 1
+            assert (tmp_path / 'foo.xml').read_text() == 'complete'
+
+            utils.download_url_with_retries('https://example.com/foo.xml', tmp_path, 'foo.xml')
+            assert mock_download.call_count == 2
+
+    with patch('burst2safe.utils.asf_search.download_url', side_effect=ConnectionError) as mock_download:
+        with patch('burst2safe.utils.time.sleep'):
+            with pytest.raises(ValueError, match='Failed to download bar.xml after 3 attempts.'):
+                utils.download_url_with_retries('https://example.com/bar.xml', tmp_path, 'bar.xml')
+            assert mock_download.call_count == 3
+            assert not (tmp_path / 'bar.xml').exists()
+
+
 def test_flatten():
     assert utils.flatten([[1, 2], [3, 4], [5, 6]]) == [1, 2, 3, 4, 5, 6]
 